@@ -1,6 +1,8 @@
 import logging
 import sys
 
+from google.protobuf.internal import api_implementation
+
 from . import blueking_pb2 as _blueking_pb2
 
 _ = sys.modules.setdefault("blueking_pb2", _blueking_pb2)
@@ -28,7 +30,7 @@ def configure_logging(log_file: str = "latest.log", log_level: int = logging.INF
 
     file_handler = logging.FileHandler(
         log_file,
-        mode="w",
+        mode="a",
         encoding="utf-8",
     )
     file_handler.set_name("blueking_latest_log")
@@ -41,4 +43,19 @@ def configure_logging(log_file: str = "latest.log", log_level: int = logging.INF
         root_logger.setLevel(log_level)
 
 
+def _check_protobuf_backend() -> None:
+    """
+    Warn when protobuf runs on the pure-Python backend instead of upb/cpp.
+
+    :return: None.
+    """
+    backend = api_implementation.Type()
+    if backend == "python":
+        logging.getLogger(__name__).warning(
+            "protobuf is using the pure-Python backend; install a protobuf wheel with "
+            + "upb support or unset PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION=python"
+        )
+
+
 configure_logging()
+_check_protobuf_backend()
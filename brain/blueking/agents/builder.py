@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 from typing import Any
 
 from crewai import Agent
@@ -18,9 +19,10 @@ def _normalize_name(name: str) -> str:
     :param name: Original agent name.
     :return: Normalized module-friendly name.
     """
-    return name.replace("-", "_")
+    return name if "-" not in name else name.replace("-", "_")
 
 
+@functools.cache
 def _resolve_package(name: str) -> str:
     """
     Build the full package path for an agent module.
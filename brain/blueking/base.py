@@ -4,7 +4,15 @@ from typing import Any
 
 from crewai import LLM
 
-logger = getLogger()
+logger = getLogger(__name__)
+
+# Environment-backed LLM settings, resolved once at import; validated per instance.
+_ENV_CONFIG: dict[str, str | None] = {
+    "api_key": os.environ.get("BLUEKING_API_KEY", None),
+    # "provider": os.environ.get("BLUEKING_API_PROVIDER", "openai"),
+    "api_base": os.environ.get("BLUEKING_API_BASE", None),
+    "model": os.environ.get("BLUEKING_API_MODEL", None),
+}
 
 
 class BKLLM(LLM):
@@ -16,7 +24,7 @@ class BKLLM(LLM):
         :param kwargs: Additional keyword arguments forwarded to the LLM constructor.
         :return: A fully configured LLM instance.
         """
-        model = os.environ.get("BLUEKING_API_MODEL", None)
+        model = _ENV_CONFIG["model"]
         if model is None:
             raise ValueError("Model must be set via BLUEKING_API_MODEL")
 
@@ -30,14 +38,7 @@ class BKLLM(LLM):
         :param kwargs: Keyword arguments forwarded to the base LLM.
         :return: None.
         """
-        env_config = {
-            "api_key": os.environ.get("BLUEKING_API_KEY", None),
-            # "provider": os.environ.get("BLUEKING_API_PROVIDER", "openai"),
-            "api_base": os.environ.get("BLUEKING_API_BASE", None),
-            "model": os.environ.get("BLUEKING_API_MODEL", None),
-        }
-
-        merged = {**env_config, **kwargs}
+        merged = {**_ENV_CONFIG, **kwargs}
 
         if not all([merged["api_base"], merged["model"]]):
             logger.error(
@@ -24,13 +24,14 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0e\x62lueking.proto\x12\x08\x62lueking\".\n\tChatEvent\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x0f\n\x07message\x18\x02 \x01(\t\"\x1d\n\x0c\x43hatResponse\x12\r\n\x05reply\x18\x01 \x01(\t\")\n\x16SendChatMessageRequest\x12\x0f\n\x07payload\x18\x01 \x01(\t\"\xa1\x01\n\x17SendChatMessageResponse\x12\x38\n\x06status\x18\x01 \x01(\x0e\x32(.blueking.SendChatMessageResponse.Status\x12\x15\n\rerror_message\x18\x02 \x01(\t\"5\n\x06Status\x12\x06\n\x02OK\x10\x00\x12\x12\n\x0eNO_CHAT_CLIENT\x10\x01\x12\x0f\n\x0bSEND_FAILED\x10\x02\x32<\n\x05\x42rain\x12\x33\n\x04\x43hat\x12\x13.blueking.ChatEvent\x1a\x16.blueking.ChatResponse2a\n\x07Gestalt\x12V\n\x0fSendChatMessage\x12 .blueking.SendChatMessageRequest\x1a!.blueking.SendChatMessageResponse2\t\n\x07Storageb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0e\x62lueking.proto\x12\x08\x62lueking\".\n\tChatEvent\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x0f\n\x07message\x18\x02 \x01(\t\"\x1d\n\x0c\x43hatResponse\x12\r\n\x05reply\x18\x01 \x01(\t\")\n\x16SendChatMessageRequest\x12\x0f\n\x07payload\x18\x01 \x01(\t\"\xa1\x01\n\x17SendChatMessageResponse\x12\x38\n\x06status\x18\x01 \x01(\x0e\x32(.blueking.SendChatMessageResponse.Status\x12\x15\n\rerror_message\x18\x02 \x01(\t\"5\n\x06Status\x12\x06\n\x02OK\x10\x00\x12\x12\n\x0eNO_CHAT_CLIENT\x10\x01\x12\x0f\n\x0bSEND_FAILED\x10\x02\x32<\n\x05\x42rain\x12\x33\n\x04\x43hat\x12\x13.blueking.ChatEvent\x1a\x16.blueking.ChatResponse2a\n\x07Gestalt\x12V\n\x0fSendChatMessage\x12 .blueking.SendChatMessageRequest\x1a!.blueking.SendChatMessageResponse2\t\n\x07StorageB\x02H\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'blueking_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
-  DESCRIPTOR._loaded_options = None
+  _globals['DESCRIPTOR']._loaded_options = None
+  _globals['DESCRIPTOR']._serialized_options = b'H\001'
   _globals['_CHATEVENT']._serialized_start=28
   _globals['_CHATEVENT']._serialized_end=74
   _globals['_CHATRESPONSE']._serialized_start=76
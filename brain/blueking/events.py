@@ -1,13 +1,28 @@
 from __future__ import annotations
 
 import asyncio
+from collections import deque
+from collections.abc import Callable
 from dataclasses import dataclass
-from typing import TypeAlias, TypeGuard
+from typing import Any, TypeAlias, final
 
 import blueking_pb2
 
 
-BrainEvent: TypeAlias = "blueking_pb2.ChatEvent"
+@dataclass(frozen=True, slots=True)
+class ChatPayload:
+    """
+    Plain copy of an inbound chat event detached from the protobuf message.
+
+    :param username: Name of the player who sent the message.
+    :param message: Raw chat message text.
+    """
+
+    username: str
+    message: str
+
+
+BrainEvent: TypeAlias = "ChatPayload"
 
 
 @dataclass
@@ -23,17 +38,134 @@ class BrainSubmission:
     response: asyncio.Future[str]
 
 
-def chatevent_typeguard(event: BrainEvent) -> TypeGuard[blueking_pb2.ChatEvent]:
-    return isinstance(event, blueking_pb2.ChatEvent)
+def _from_payload(event: ChatPayload) -> ChatPayload:
+    """
+    Pass through events that are already ChatPayload instances.
+
+    :param event: Chat payload to return unchanged.
+    :return: The same payload.
+    """
+    return event
+
+
+def _from_chatevent(event: blueking_pb2.ChatEvent) -> ChatPayload:
+    """
+    Copy the fields of a protobuf ChatEvent into a ChatPayload.
+
+    :param event: Protobuf chat event.
+    :return: Equivalent ChatPayload.
+    """
+    return ChatPayload(username=event.username, message=event.message)
+
+
+# Exact-type dispatch; register new event types here.
+_GUARDS: dict[type, Callable[[Any], BrainEvent]] = {
+    ChatPayload: _from_payload,
+    blueking_pb2.ChatEvent: _from_chatevent,
+}
+
+
+def autocast(event: object) -> BrainEvent:
+    """
+    Normalize a supported event object into a BrainEvent.
+
+    :param event: Event instance received from a transport.
+    :return: Event converted to the Brain's internal representation.
+    :raises ValueError: When the event type has no registered handler.
+    """
+    handler = _GUARDS.get(type(event))
+    if handler is None:
+        raise ValueError(f"Event type not supported: {type(event)}")
+    return handler(event)
+
+
+@final
+class BrainChannel:
+    """
+    Single-consumer handoff of Brain submissions backed by a deque and events.
+
+    Avoids the per-item waiter futures of asyncio.Queue; closing the channel
+    replaces the ``None`` sentinel and makes ``get`` return None once drained.
+    A positive ``maxsize`` makes ``put`` wait for room, applying backpressure.
+    """
+
+    __slots__ = ("_items", "_maxsize", "_not_empty", "_not_full", "_closed")
+
+    def __init__(self, maxsize: int = 0) -> None:
+        """
+        Create an empty, open channel.
+
+        :param maxsize: Maximum number of queued submissions; 0 means unbounded.
+        :return: None.
+        """
+        self._items: deque[BrainSubmission] = deque()
+        self._maxsize: int = maxsize
+        self._not_empty: asyncio.Event = asyncio.Event()
+        self._not_full: asyncio.Event = asyncio.Event()
+        self._not_full.set()
+        self._closed: bool = False
+
+    def full(self) -> bool:
+        """
+        Report whether the channel has reached its size limit.
+
+        :return: True when a put would have to wait.
+        """
+        return 0 < self._maxsize <= len(self._items)
+
+    def put_nowait(self, submission: BrainSubmission) -> None:
+        """
+        Enqueue a submission and wake the consumer.
+
+        :param submission: Submission to hand to the Brain.
+        :raises RuntimeError: When the channel has been closed.
+        :raises asyncio.QueueFull: When the channel is at its size limit.
+        :return: None.
+        """
+        if self._closed:
+            raise RuntimeError("Brain channel is closed")
+        if self.full():
+            raise asyncio.QueueFull
+        self._items.append(submission)
+        self._not_empty.set()
+
+    async def put(self, submission: BrainSubmission) -> None:
+        """
+        Enqueue a submission, waiting while the channel is full.
+
+        :param submission: Submission to hand to the Brain.
+        :raises RuntimeError: When the channel is or becomes closed.
+        :return: None.
+        """
+        while self.full() and not self._closed:
+            self._not_full.clear()
+            _ = await self._not_full.wait()
+        self.put_nowait(submission)
+
+    async def get(self) -> BrainSubmission | None:
+        """
+        Wait for the next submission.
 
+        :return: Next submission, or None once the channel is closed and drained.
+        """
+        while not self._items:
+            if self._closed:
+                return None
+            self._not_empty.clear()
+            _ = await self._not_empty.wait()
+        submission = self._items.popleft()
+        self._not_full.set()
+        return submission
 
-guards = [chatevent_typeguard]
+    def close(self) -> None:
+        """
+        Stop accepting submissions and release the consumer after it drains.
 
-def autocast(event: BrainEvent) -> blueking_pb2.ChatEvent:
-    for guard in guards:
-        if guard(event):
-            return event
-    raise ValueError(f"Event type not supported: {type(event)}")
+        :return: None.
+        """
+        self._closed = True
+        self._not_empty.set()
+        self._not_full.set()
 
 
-BrainQueue: TypeAlias = "asyncio.Queue[BrainSubmission | None]"
+BrainQueue: TypeAlias = "BrainChannel"
@@ -26,6 +26,15 @@ class ExampleFlow(Flow[ExampleFlowState]):
         super().__init__(**kwargs)
         self.gestalt_agent: Agent | None = gestalt_agent
 
+    def reset_state(self) -> None:
+        """
+        Clear per-run state so a pooled flow instance can be kicked off again.
+
+        :return: None.
+        """
+        self.state.prompt = ""
+        self.state.echo = ""
+
     @start()
     def pick_prompt(self, crewai_trigger_payload: dict[str, Any] | None = None) -> None:
         """
@@ -3,21 +3,42 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
+import weakref
 from contextvars import ContextVar
 from typing import cast, override
 
 import grpc
 from grpc.aio import ServicerContext
 
-from blueking.events import BrainQueue, BrainSubmission
+from blueking.events import BrainQueue, BrainSubmission, ChatPayload
 from blueking import blueking_pb2, blueking_pb2_grpc
 
+_ChatResponse = blueking_pb2.ChatResponse
+_SendChatMessageRequest = blueking_pb2.SendChatMessageRequest
+
 DEFAULT_BRAIN_BIND = "127.0.0.1:50051"
 DEFAULT_GESTALT_ENDPOINT = "127.0.0.1:50052"
+DEFAULT_QUEUE_PUT_TIMEOUT = 5.0
+# Keep the long-lived Gestalt channel warm and give bursts a larger HTTP/2 window.
+OUTBOUND_CHANNEL_OPTIONS: tuple[tuple[str, int], ...] = (
+    ("grpc.keepalive_time_ms", 10_000),
+    ("grpc.keepalive_timeout_ms", 5_000),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.http2.lookahead_bytes", 1 << 20),
+)
+BRAIN_SERVER_OPTIONS: tuple[tuple[str, int], ...] = (
+    ("grpc.max_concurrent_streams", 1024),
+)
 _gestalt_endpoint_override: str | None = None
 _outbound_stub: ContextVar[blueking_pb2_grpc.GestaltStub | None] = ContextVar(
     "blueking.grpc.outbound_stub", default=None
 )
+# One reusable request per task; the owner check stops child tasks that inherit
+# the context from mutating a message their parent is still sending.
+_request_local: ContextVar[
+    tuple[weakref.ref[asyncio.Task[object]] | None, blueking_pb2.SendChatMessageRequest] | None
+] = ContextVar("blueking.grpc.send_chat_request", default=None)
 logger = logging.getLogger(__name__)
 
 
@@ -60,17 +81,30 @@ async def serve_brain(
     :return: None.
     """
     address = bind or os.getenv("BRAIN_GRPC_ADDR", DEFAULT_BRAIN_BIND)
-    server = grpc.aio.server()
+    put_timeout = float(os.getenv("BRAIN_QUEUE_PUT_TIMEOUT", DEFAULT_QUEUE_PUT_TIMEOUT))
+    server = grpc.aio.server(options=BRAIN_SERVER_OPTIONS)
 
     class _BrainServicer(blueking_pb2_grpc.BrainServicer):
         @override
         async def Chat(self, request: blueking_pb2.ChatEvent, context: ServicerContext[blueking_pb2.ChatEvent,blueking_pb2.ChatResponse]):
             future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
             submission = BrainSubmission(
-                event=blueking_pb2.ChatEvent(username=request.username, message=request.message),
+                event=ChatPayload(username=request.username, message=request.message),
                 response=future,
             )
-            await queue.put(submission)
+            try:
+                await asyncio.wait_for(queue.put(submission), timeout=put_timeout)
+            except TimeoutError:
+                logger.warning("Brain queue saturated; rejecting chat event")
+                context.set_details("Brain is saturated")
+                context.set_code(grpc.StatusCode.RESOURCE_EXHAUSTED)
+                return _ChatResponse()
+            except RuntimeError:
+                # The channel is closed once shutdown starts; waiting producers are woken into this.
+                logger.info("Brain is shutting down; rejecting chat event")
+                context.set_details("Brain is shutting down")
+                context.set_code(grpc.StatusCode.UNAVAILABLE)
+                return _ChatResponse()
             try:
                 reply = await future
             except asyncio.CancelledError:
@@ -80,7 +114,7 @@ async def serve_brain(
                 context.set_details("Internal server error")
                 context.set_code(grpc.StatusCode.INTERNAL)
                 raise
-            return blueking_pb2.ChatResponse(reply=reply)
+            return _ChatResponse(reply=reply)
 
     blueking_pb2_grpc.add_BrainServicer_to_server(_BrainServicer(), server)
     _ = server.add_insecure_port(address)
@@ -126,7 +160,7 @@ async def outbound_connection(endpoint: str | None = None) -> None:
         or _gestalt_endpoint_override
         or os.getenv("GESTALT_GRPC_ENDPOINT", DEFAULT_GESTALT_ENDPOINT)
     )
-    async with grpc.aio.insecure_channel(target) as channel:
+    async with grpc.aio.insecure_channel(target, options=OUTBOUND_CHANNEL_OPTIONS) as channel:
         stub = blueking_pb2_grpc.GestaltStub(channel)
         token = _outbound_stub.set(stub)
         try:
@@ -135,6 +169,22 @@ async def outbound_connection(endpoint: str | None = None) -> None:
             _outbound_stub.reset(token)
 
 
+def _task_request() -> blueking_pb2.SendChatMessageRequest:
+    """
+    Return the SendChatMessageRequest owned by the current task, creating it once.
+
+    :return: Reusable request message for the running task.
+    """
+    task = asyncio.current_task()
+    owner = None if task is None else weakref.ref(task)
+    cached = _request_local.get()
+    if cached is not None and cached[0] == owner:
+        return cached[1]
+    request = _SendChatMessageRequest()
+    _ = _request_local.set((owner, request))
+    return request
+
+
 async def send_chat_message(
     payload: str,
 ) -> blueking_pb2.SendChatMessageResponse:
@@ -146,5 +196,7 @@ async def send_chat_message(
     :return: Response from the Gestalt SendChatMessage RPC.
     """
     stub = _get_outbound_stub()
-    request = blueking_pb2.SendChatMessageRequest(payload=payload)
+    request = _task_request()
+    request.Clear()
+    request.payload = payload
     return cast(blueking_pb2.SendChatMessageResponse,await stub.SendChatMessage(request))
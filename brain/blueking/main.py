@@ -3,28 +3,41 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Any
+import os
+import sys
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
 
 from crewai import Agent
-from crewai.flow import Flow, listen, router, start
-from crewai.flow.visualization.builder import build_flow_structure
-from crewai.flow.visualization.renderers.interactive import render_interactive
-from crewai.flow.visualization.types import FlowStructure, StructureEdge
+from crewai.flow import Flow, router, start
 
 from blueking.agents.builder import build_agent
-from blueking.events import BrainSubmission, BrainQueue
+from blueking.events import BrainChannel, BrainSubmission, BrainQueue
 from blueking.flows.example_flow import ExampleFlow
 from blueking.grpc import outbound_connection, serve_brain
+from blueking.utils.batch_writer import memory_writer
 from blueking.utils.context import (
-    init_chroma,
+    load_chroma,
+    publish_chroma,
     set_brain_state,
     reset_brain_state,
 )
 from blueking.utils.state_db import LmdbDict, BrainState
 
+if TYPE_CHECKING:
+    from contextvars import Token
+
+    from chromadb import Collection
+    from chromadb.api import ClientAPI
+    from crewai.flow.visualization.types import FlowStructure
+
 
 logger = logging.getLogger(__name__)
 
+FLOW_POOL_SIZE = 4
+DEFAULT_QUEUE_MAX = 256
+DEFAULT_SHUTDOWN_TIMEOUT = 10.0
+
 
 class Brain(Flow[LmdbDict]):  # pyright: ignore[reportInvalidTypeArguments]
     state: BrainState  # pyright:ignore[reportIncompatibleMethodOverride]
@@ -46,9 +59,10 @@ class Brain(Flow[LmdbDict]):  # pyright: ignore[reportInvalidTypeArguments]
         self._queue: BrainQueue | None = queue
         self._tasks: set[asyncio.Task[Any]] = set()
         self._gestalt: Agent = gestalt_agent or build_agent("gestalt")
+        self._flow_pool: list[ExampleFlow] = [
+            ExampleFlow(gestalt_agent=self._gestalt) for _ in range(FLOW_POOL_SIZE)
+        ]
         super().__init__(**kwargs)
-        # Initialize shared Chroma store once at startup.
-        _ = init_chroma()
 
     @property
     def gestalt(self) -> Agent:
@@ -68,7 +82,7 @@ class Brain(Flow[LmdbDict]):  # pyright: ignore[reportInvalidTypeArguments]
         """
         if self._queue is None:
             raise RuntimeError("Brain queue is not configured")
-        logger.info("Brain waiting for submissions")
+        logger.debug("Brain waiting for submissions")
         try:
             submission = await self._queue.get()
         except KeyboardInterrupt:
@@ -76,45 +90,26 @@ class Brain(Flow[LmdbDict]):  # pyright: ignore[reportInvalidTypeArguments]
             return None
         if submission is None:
             await self._await_pending_tasks()
-        logger.info("Brain received submission")
+        logger.debug("Brain received submission")
         return submission
 
     @router(intake)
-    def route_submission(self, submission: BrainSubmission | None) -> str | None:
-        """
-        Route the intake output toward processing listeners.
-
-        :param submission: BrainSubmission instance or None sentinel from the queue.
-        :return: Routing label for downstream listeners.
-        """
-        if submission is None:
-            return None
-        return "process_submission"
-
-    @listen("process_submission")
-    async def handle_submission(self, submission: BrainSubmission) -> str | None:
+    async def handle_submission(self, submission: BrainSubmission | None) -> str | None:
         """
         Launch processing for a single brain submission and continue the intake loop.
 
-        :param submission: Incoming chat submission wrapper.
+        Routing is fused into this handler: a None sentinel ends the loop, any
+        submission is spawned in the background and intake is re-triggered.
+
+        :param submission: Incoming chat submission wrapper or None sentinel from the queue.
         :return: Continuation trigger name or None when not continuing.
         """
+        if submission is None:
+            return None
         task = asyncio.create_task(self._process_submission(submission))
         self._track_task(task)
         return "continue_intake"
 
-    @router(handle_submission)
-    def continue_loop(self, result: str | None) -> str | None:
-        """
-        Signal the intake method to pull the next submission while tasks run.
-
-        :param result: Result emitted by the submission handler.
-        :return: Trigger to re-run intake or None to stop looping.
-        """
-        if result != "continue_intake":
-            return None
-        return "continue_intake"
-
     async def _process_submission(self, submission: BrainSubmission) -> None:
         """
         Execute the example flow for an incoming submission and reply.
@@ -122,12 +117,15 @@ class Brain(Flow[LmdbDict]):  # pyright: ignore[reportInvalidTypeArguments]
         :param submission: Incoming chat submission wrapper.
         :return: None.
         """
-        self.state.username = submission.event.username
-        self.state.message = submission.event.message
-        state_token = set_brain_state(self.state)
-
-        example_flow = ExampleFlow(gestalt_agent=self._gestalt)
+        state_token: Token[BrainState | None] | None = None
+        example_flow: ExampleFlow | None = None
+        # Everything that can fail stays inside the try so it is logged and replied to.
         try:
+            self.state.username = submission.event.username
+            self.state.message = submission.event.message
+            state_token = set_brain_state(self.state)
+
+            example_flow = self._acquire_flow()
             _ = await example_flow.kickoff_async(
                 inputs={
                     "crewai_trigger_payload": {
@@ -139,60 +137,95 @@ class Brain(Flow[LmdbDict]):  # pyright: ignore[reportInvalidTypeArguments]
             self.state.reply = reply
             if not submission.response.done():
                 submission.response.set_result(reply)
-        except Exception as exc:  # pragma: no cover - handled by task tracking
+        except Exception as exc:  # pragma: no cover - surfaced via the reply future
             logger.exception("Failed to process submission", exc_info=exc)
             if not submission.response.done():
                 submission.response.set_exception(exc)
-            raise
         finally:
-            reset_brain_state(state_token)
+            if example_flow is not None:
+                self._release_flow(example_flow)
+            if state_token is not None:
+                reset_brain_state(state_token)
 
-    def _track_task(self, task: asyncio.Task[Any]) -> None:
+    def _acquire_flow(self) -> ExampleFlow:
         """
-        Track background tasks and log any raised exceptions.
+        Take a reset ExampleFlow from the pool, building a new one when it is empty.
 
-        :param task: Task to monitor until completion.
-        :return: None.
+        :return: ExampleFlow ready for kickoff.
         """
-        self._tasks.add(task)
+        if not self._flow_pool:
+            return ExampleFlow(gestalt_agent=self._gestalt)
+        flow = self._flow_pool.pop()
+        flow.reset_state()
+        return flow
 
-        def _remove(completed: asyncio.Task[Any]) -> None:
-            """
-            Remove completed tasks from tracking and surface exceptions.
+    def _release_flow(self, flow: ExampleFlow) -> None:
+        """
+        Return an ExampleFlow to the pool unless the pool is already full.
 
-            :param completed: Task that finished running.
-            :return: None.
-            """
-            self._tasks.discard(completed)
-            if completed.cancelled():
-                return
-            exception = completed.exception()
-            if exception is not None:
-                logger.exception("Brain event task raised", exc_info=exception)
+        :param flow: Flow instance that finished running.
+        :return: None.
+        """
+        if len(self._flow_pool) < FLOW_POOL_SIZE:
+            self._flow_pool.append(flow)
+
+    def _track_task(self, task: asyncio.Task[Any]) -> None:
+        """
+        Keep a strong reference to a background task until it completes.
 
-        task.add_done_callback(_remove)
+        :param task: Task to retain until completion.
+        :return: None.
+        """
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
 
     async def _await_pending_tasks(self) -> None:
         """
-        Await all currently tracked tasks to ensure clean shutdown.
+        Await all currently tracked tasks and pending memory writes to ensure clean shutdown.
 
         :return: None.
         """
+        # Done callbacks prune self._tasks while draining; loop in case more were added.
         while self._tasks:
-            _ = await asyncio.wait(self._tasks.copy(), return_when=asyncio.ALL_COMPLETED)
+            _ = await asyncio.gather(*self._tasks, return_exceptions=True)
+        # Memories are written by a background thread; drain them without blocking the loop.
+        if failed := await asyncio.to_thread(memory_writer.flush):
+            logger.error("%d memories were not persisted: %s", len(failed), ", ".join(failed))
 
 
-async def _run_brain(queue: BrainQueue) -> None:
+async def _run_brain(
+    queue: BrainQueue,
+    chroma: asyncio.Task[tuple[ClientAPI, Collection]],
+) -> None:
     """
-    Kick off the Brain flow with the provided queue.
+    Kick off the Brain flow with the provided queue once Chroma is ready.
 
     :param queue: Queue for receiving chat submissions.
+    :param chroma: Task initializing the shared Chroma store off the event loop.
     :return: None.
     """
     brain = Brain(queue=queue)
+    # Publish before kickoff so every flow task inherits the Chroma handles.
+    publish_chroma(*await chroma)
     _ = await brain.kickoff_async()
 
 
+async def _stop_brain(brain_task: asyncio.Task[None]) -> None:
+    """
+    Let the Brain drain the closed channel and pending work, cancelling it on timeout.
+
+    :param brain_task: Task running the Brain flow; the channel must already be closed.
+    :return: None.
+    """
+    if brain_task.done():
+        return
+    timeout = float(os.getenv("BRAIN_SHUTDOWN_TIMEOUT", DEFAULT_SHUTDOWN_TIMEOUT))
+    done, _ = await asyncio.wait({brain_task}, timeout=timeout)
+    if not done:
+        logger.warning("Brain did not drain within %.1fs; cancelling it", timeout)
+        _ = brain_task.cancel()
+
+
 async def main(queue: BrainQueue) -> None:
     """
     Start inbound/outbound gRPC services and the Brain flow lifecycle.
@@ -201,7 +234,9 @@ async def main(queue: BrainQueue) -> None:
     :return: None.
     """
     shutdown_event = asyncio.Event()
-    brain_task = asyncio.create_task(_run_brain(queue))
+    # Warm up Chroma in a worker thread while the gRPC services come up.
+    chroma_task = asyncio.create_task(asyncio.to_thread(load_chroma))
+    brain_task = asyncio.create_task(_run_brain(queue, chroma_task))
     inbound_task = asyncio.create_task(serve_brain(queue=queue, shutdown=shutdown_event))
     outbound_task = asyncio.create_task(outbound_connection())
 
@@ -214,11 +249,12 @@ async def main(queue: BrainQueue) -> None:
         :param message: Optional log message describing the shutdown reason.
         :return: None.
         """
-        await queue.put(None)
+        queue.close()
         shutdown_event.set()
         for task in tasks:
-            if not task.done():
+            if task is not brain_task and not task.done():
                 _ = task.cancel()
+        await _stop_brain(brain_task)
         _ = await asyncio.gather(*tasks, return_exceptions=True)
         if message:
             logger.info(message)
@@ -232,11 +268,14 @@ async def main(queue: BrainQueue) -> None:
         await _cleanup("Cancellation requested; shutting down Brain services.")
         return
 
-    await queue.put(None)
+    queue.close()
     shutdown_event.set()
 
     for task in pending:
-        _ = task.cancel()
+        if task is not brain_task:
+            _ = task.cancel()
+    # Intake sees the closed channel, awaits in-flight submissions and flushes memories.
+    await _stop_brain(brain_task)
 
     _ = await asyncio.gather(*pending, return_exceptions=True)
 
@@ -253,11 +292,28 @@ async def _run_with_queue() -> None:
 
     :return: None.
     """
-    queue: BrainQueue = asyncio.Queue()
+    queue: BrainQueue = BrainChannel(
+        maxsize=int(os.getenv("BRAIN_QUEUE_MAX", DEFAULT_QUEUE_MAX))
+    )
     try:
         await main(queue)
     except KeyboardInterrupt:
-        await queue.put(None)
+        queue.close()
+
+
+def _loop_factory() -> Callable[[], asyncio.AbstractEventLoop] | None:
+    """
+    Pick the uvloop event loop when the optional dependency is installed.
+
+    :return: uvloop loop factory, or None to use the default asyncio loop.
+    """
+    if sys.platform == "win32":
+        return None
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
 
 
 def kickoff() -> None:
@@ -267,7 +323,7 @@ def kickoff() -> None:
     :return: None.
     """
     try:
-        asyncio.run(_run_with_queue())
+        asyncio.run(_run_with_queue(), loop_factory=_loop_factory())
         print()
     except KeyboardInterrupt:
         logger.info("Keyboard interrupt received; exiting cleanly.")
@@ -281,46 +337,46 @@ def _namespace_structure(structure: FlowStructure, namespace: str) -> FlowStruct
     :param namespace: Namespace prefix to apply.
     :return: Namespaced FlowStructure copy.
     """
-    nodes = {f"{namespace}.{name}": meta for name, meta in structure["nodes"].items()}
-    edges: list[StructureEdge] = []
-    for edge in structure["edges"]:
-        edges.append(
-            StructureEdge(
-                source=f"{namespace}.{edge['source']}",  # pyright:ignore[reportTypedDictNotRequiredAccess]
-                target=f"{namespace}.{edge['target']}",  # pyright:ignore[reportTypedDictNotRequiredAccess]
-                condition_type=edge.get("condition_type"),
-                is_router_path=edge.get("is_router_path", False),
-                **(
-                    {}
-                    if "router_path_label" not in edge
-                    else {"router_path_label": edge["router_path_label"]}
-                ),
-            )
+    from crewai.flow.visualization.types import FlowStructure, StructureEdge
+
+    prefix = f"{namespace}.".__add__
+    nodes = structure["nodes"]
+    edges = [
+        StructureEdge(
+            source=prefix(edge["source"]),  # pyright:ignore[reportTypedDictNotRequiredAccess]
+            target=prefix(edge["target"]),  # pyright:ignore[reportTypedDictNotRequiredAccess]
+            condition_type=edge.get("condition_type"),
+            is_router_path=edge.get("is_router_path", False),
+            **(
+                {}
+                if "router_path_label" not in edge
+                else {"router_path_label": edge["router_path_label"]}
+            ),
         )
+        for edge in structure["edges"]
+    ]
 
     return FlowStructure(
-        nodes=nodes,
+        nodes=dict(zip(map(prefix, nodes), nodes.values())),
         edges=edges,
-        start_methods=[f"{namespace}.{name}" for name in structure["start_methods"]],
-        router_methods=[f"{namespace}.{name}" for name in structure["router_methods"]],
+        start_methods=list(map(prefix, structure["start_methods"])),
+        router_methods=list(map(prefix, structure["router_methods"])),
     )
 
 
 def _merge_structures(base: FlowStructure, addition: FlowStructure) -> FlowStructure:
     """
-    Combine two FlowStructure graphs into one.
+    Merge a FlowStructure graph into another in place.
 
-    :param base: Existing FlowStructure.
+    :param base: Existing FlowStructure; mutated to include the addition.
     :param addition: FlowStructure to merge into the base.
-    :return: Combined FlowStructure containing nodes and edges from both.
+    :return: The base FlowStructure, now containing nodes and edges from both.
     """
-    merged = FlowStructure(
-        nodes={**base["nodes"], **addition["nodes"]},
-        edges=[*base["edges"], *addition["edges"]],
-        start_methods=[*base["start_methods"], *addition["start_methods"]],
-        router_methods=[*base["router_methods"], *addition["router_methods"]],
-    )
-    return merged
+    base["nodes"].update(addition["nodes"])
+    base["edges"].extend(addition["edges"])
+    base["start_methods"].extend(addition["start_methods"])
+    base["router_methods"].extend(addition["router_methods"])
+    return base
 
 
 def plot(show: bool = True) -> None:
@@ -330,6 +386,11 @@ def plot(show: bool = True) -> None:
     :param show: Whether to open the visualization after rendering.
     :return: None.
     """
+    # Visualization pulls in a large dependency tree; keep it out of the serving path.
+    from crewai.flow.visualization.builder import build_flow_structure
+    from crewai.flow.visualization.renderers.interactive import render_interactive
+    from crewai.flow.visualization.types import StructureEdge
+
     brain = Brain()
     brain_structure = build_flow_structure(brain)
 
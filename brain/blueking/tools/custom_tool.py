@@ -1,17 +1,22 @@
 from __future__ import annotations
 
-import uuid
+import os
 from typing import Any, override
 
+from chromadb.api.types import validate_metadata
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+from blueking.utils.batch_writer import DEFAULT_MAX_LATENCY, PendingWrite, memory_writer
 from blueking.utils.context import (
-    embed_text,
+    embed_text_np,
     ensure_gestalt_collection,
     get_brain_state,
 )
 
+# Metadata copied into every memorized record; caller metadata may override it.
+_BASE_META: dict[str, Any] = {"source": "gestalt"}
+
 
 class MemorizeInput(BaseModel):
     """Input schema for MemorizeTool."""
@@ -27,7 +32,9 @@ class MemorizeTool(BaseTool):
     name: str = "memorize"
     description: str = (
         "Store information in the Gestalt memory for future recall. "
-        "Use this to persist important context, facts, or summaries."
+        "Use this to persist important context, facts, or summaries. "
+        f"Entries are written in the background and may take up to {DEFAULT_MAX_LATENCY:g} "
+        "seconds before recall finds them."
     )
     args_schema: type[BaseModel] = MemorizeInput
     
@@ -39,22 +46,31 @@ class MemorizeTool(BaseTool):
         :param content: Text to store for later recall.
         :param metadata: Optional metadata to accompany the content.
         :return: Human-readable confirmation containing the record id.
+        :raises ValueError: When the metadata holds values Chroma cannot store.
         """
         collection = ensure_gestalt_collection()
-        embedding = embed_text(content)
+        embedding = embed_text_np(content)
         state = get_brain_state()
-        meta = {"source": "gestalt"}
-        if state is not None:
-            meta["username"] = state.username
-        if metadata:
-            meta.update(metadata)
-
-        record_id = str(uuid.uuid4())
-        collection.add(
-            ids=[record_id],
-            documents=[content],
-            embeddings=[embedding],
-            metadatas=[meta],
+        meta = {
+            **_BASE_META,
+            **({"username": state.username} if state is not None else {}),
+            **(metadata or {}),
+        }
+        # Records are written in shared batches later; reject bad metadata here so it
+        # fails this call only and the agent sees the error.
+        _ = validate_metadata(meta)
+
+        # 128 random bits as 32 hex chars; skips building and formatting a UUID object.
+        record_id = os.urandom(16).hex()
+        # Written asynchronously in batches; may take up to the writer latency to be recallable.
+        memory_writer.submit(
+            PendingWrite(
+                collection=collection,
+                record_id=record_id,
+                document=content,
+                embedding=embedding,
+                metadata=meta,
+            )
         )
         return f"Memorized entry {record_id}"
 
@@ -89,7 +105,7 @@ class RecallTool(BaseTool):
         :return: Formatted summary of matching documents.
         """
         collection = ensure_gestalt_collection()
-        embedding = embed_text(query)
+        embedding = embed_text_np(query)
         result = collection.query(query_embeddings=[embedding], n_results=limit)
         
         docs = result.get("documents", [[]]) if result else []
@@ -104,18 +120,17 @@ class RecallTool(BaseTool):
         if metadatas:
             metadatas = metadatas[0]
         else:
-            raise RuntimeError("Metadata should length of retrieved documents")
+            raise RuntimeError("Metadata should match the length of retrieved documents")
 
         if distances:
             distances = distances[0]
         else:
-            raise RuntimeError("Metadata should length of retrieved documents")
+            raise RuntimeError("Distances should match the length of retrieved documents")
 
-        lines: list[str] = []
-        for doc, meta, dist in zip(docs, metadatas, distances, strict=True):
-            meta_info = f"meta={meta}" if meta else "meta={}"
-            lines.append(f"- score={dist:.4f} {meta_info} -> {doc}")
-        return "Recalling memories:\n" + "\n".join(lines)
+        return "Recalling memories:\n" + "\n".join(
+            f"- score={dist:.4f} meta={meta or {}} -> {doc}"
+            for doc, meta, dist in zip(docs, metadatas, distances, strict=True)
+        )
 
 
 # Retain example tool for reference; not intended for Gestalt use.
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+from chromadb import Collection
+from chromadb.api.types import Metadata
+
+DEFAULT_BATCH_SIZE = 128
+DEFAULT_MAX_LATENCY = 0.2
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class PendingWrite:
+    """
+    A single record waiting to be added to a Chroma collection.
+
+    :param collection: Target Chroma collection.
+    :param record_id: Identifier of the record.
+    :param document: Document text to store.
+    :param embedding: Embedding vector for the document.
+    :param metadata: Metadata stored alongside the document.
+    """
+
+    collection: Collection
+    record_id: str
+    document: str
+    embedding: npt.NDArray[np.float32]
+    metadata: dict[str, Any]
+
+
+def _write_batch(batch: list[PendingWrite]) -> list[PendingWrite]:
+    """
+    Add a batch of pending records with one Chroma call per target collection.
+
+    Chroma validates a call as a whole, so when a collection's add fails its
+    records are retried one at a time with upsert, which is idempotent if the
+    failed add was partially applied; one bad record then only loses itself.
+
+    :param batch: Pending records to persist.
+    :return: Records that could not be written individually either.
+    """
+    grouped: dict[int, list[PendingWrite]] = {}
+    for write in batch:
+        grouped.setdefault(id(write.collection), []).append(write)
+    failed: list[PendingWrite] = []
+    for writes in grouped.values():
+        metadatas: list[Metadata] = [write.metadata for write in writes]
+        try:
+            writes[0].collection.add(
+                ids=[write.record_id for write in writes],
+                documents=[write.document for write in writes],
+                embeddings=np.stack([write.embedding for write in writes]),
+                metadatas=metadatas,
+            )
+        except Exception as exc:
+            logger.warning(
+                "Retrying %d memories one by one after a failed add: %s", len(writes), exc
+            )
+            for write in writes:
+                try:
+                    write.collection.upsert(
+                        ids=[write.record_id],
+                        documents=[write.document],
+                        embeddings=[write.embedding],
+                        metadatas=[write.metadata],
+                    )
+                except Exception as retry_exc:
+                    logger.exception(
+                        "Failed to write memory %s to Chroma", write.record_id, exc_info=retry_exc
+                    )
+                    failed.append(write)
+    return failed
+
+
+class BatchingWriter:
+    """
+    Buffer Chroma inserts and flush them from a daemon thread in batches.
+
+    A batch is written once ``batch_size`` records are pending or ``max_latency``
+    seconds after its first record arrived, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_latency: float = DEFAULT_MAX_LATENCY,
+    ) -> None:
+        """
+        Create an idle writer; the flusher thread starts on the first submit.
+
+        :param batch_size: Maximum number of records per Chroma add call.
+        :param max_latency: Maximum seconds a record waits before being written.
+        :return: None.
+        """
+        self._batch_size: int = batch_size
+        self._max_latency: float = max_latency
+        self._queue: queue.Queue[PendingWrite] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock: threading.Lock = threading.Lock()
+        self._failed: list[str] = []
+
+    def submit(self, write: PendingWrite) -> None:
+        """
+        Enqueue a record for the next batch without waiting for Chroma.
+
+        :param write: Record to persist.
+        :return: None.
+        """
+        self._ensure_thread()
+        self._queue.put(write)
+
+    def flush(self) -> list[str]:
+        """
+        Block until every submitted record has been handed to Chroma.
+
+        :return: Ids of records that could not be written since the last flush.
+        """
+        if self._thread is not None:
+            self._queue.join()
+        with self._lock:
+            failed, self._failed = self._failed, []
+        return failed
+
+    def _ensure_thread(self) -> None:
+        """
+        Start the flusher thread if it is not running yet.
+
+        :return: None.
+        """
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                thread = threading.Thread(
+                    target=self._drain, name="blueking-chroma-writer", daemon=True
+                )
+                thread.start()
+                self._thread = thread
+
+    def _drain(self) -> None:
+        """
+        Collect pending records into batches and write them until the process exits.
+
+        :return: None.
+        """
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self._max_latency
+            while len(batch) < self._batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                failed = _write_batch(batch)
+            except Exception as exc:
+                logger.exception("Failed to write %d memories to Chroma", len(batch), exc_info=exc)
+                failed = batch
+            # Record failures before task_done so a concurrent flush() reports them.
+            if failed:
+                with self._lock:
+                    self._failed.extend(write.record_id for write in failed)
+            for _ in batch:
+                self._queue.task_done()
+
+
+# Shared writer for tool calls; drained before the interpreter shuts down.
+memory_writer = BatchingWriter()
+_ = atexit.register(memory_writer.flush)
+
+
+__all__ = [
+    "PendingWrite",
+    "BatchingWriter",
+    "memory_writer",
+]
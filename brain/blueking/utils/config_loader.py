@@ -1,20 +1,96 @@
+import copy
+import functools
+import json
 from importlib.resources import files
+from importlib.resources.abc import Traversable
+from pathlib import Path, PurePath
 from typing import Any
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _Loader
 
-def load_config(package: str, config_file: str) -> dict[str, Any]:
+COMPILED_SUFFIX = ".json"
+
+
+def _is_fresh(compiled: Traversable, source: Traversable) -> bool:
+    """
+    Check whether a pre-compiled config can be used in place of its YAML source.
+
+    :param compiled: Pre-compiled JSON resource.
+    :param source: YAML resource the JSON was generated from.
+    :return: True when the JSON exists and is not older than the YAML source.
+    """
+    if not compiled.is_file():
+        return False
+    if isinstance(compiled, Path) and isinstance(source, Path) and source.is_file():
+        return compiled.stat().st_mtime >= source.stat().st_mtime
+    return True
+
+
+def _mtime(resource: Traversable) -> float:
+    """
+    Read a resource modification time for cache keys.
+
+    :param resource: Package resource to inspect.
+    :return: Modification time, or 0.0 when missing or not on the filesystem.
     """
-    Load a YAML configuration file from a package resource.
+    if isinstance(resource, Path):
+        try:
+            return resource.stat().st_mtime
+        except OSError:
+            return 0.0
+    return 0.0
+
+
+@functools.lru_cache(maxsize=64)
+def _load_cached(
+    package: str, config_file: str, _source_mtime: float, _compiled_mtime: float
+) -> dict[str, Any]:
+    """
+    Parse a configuration file; memoized until either source file changes.
 
     :param package: Package containing the configuration file.
     :param config_file: Name of the YAML file to load.
-    :return: Parsed configuration dictionary.
+    :param _source_mtime: YAML modification time, used only as a cache key.
+    :param _compiled_mtime: JSON modification time, used only as a cache key.
+    :return: Parsed configuration dictionary shared by cache hits.
     """
-    config_path = files(package) / config_file
+    root = files(package)
+    config_path = root / config_file
+    compiled_path = root / str(PurePath(config_file).with_suffix(COMPILED_SUFFIX))
+    if _is_fresh(compiled_path, config_path):
+        with compiled_path.open(encoding="utf-8") as handle:
+            return json.load(handle) or {}
+
     if not config_path.is_file():
         raise FileNotFoundError(f"{config_file} not found in package {package}")
 
     with config_path.open() as handle:
-        return yaml.safe_load(handle) or {}
+        return yaml.load(handle, Loader=_Loader) or {}
+
+
+def load_config(package: str, config_file: str) -> dict[str, Any]:
+    """
+    Load a configuration file from a package resource.
+
+    Prefers the JSON file generated at build time next to the YAML source and
+    falls back to parsing the YAML when it is missing or stale. Parsed results
+    are cached until either file's modification time changes.
+
+    :param package: Package containing the configuration file.
+    :param config_file: Name of the YAML file to load.
+    :return: Parsed configuration dictionary owned by the caller.
+    """
+    root = files(package)
+    compiled_file = str(PurePath(config_file).with_suffix(COMPILED_SUFFIX))
+    config = _load_cached(
+        package,
+        config_file,
+        _mtime(root / config_file),
+        _mtime(root / compiled_file),
+    )
+    return copy.deepcopy(config)
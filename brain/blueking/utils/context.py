@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import functools
 import hashlib
 import os
+import threading
+from collections.abc import Sequence
 from contextvars import ContextVar, Token
 from pathlib import Path
 from typing import TYPE_CHECKING
+from weakref import WeakKeyDictionary
 
 import chromadb
+import numpy as np
+import numpy.typing as npt
 from chromadb import Collection
 from chromadb.api import ClientAPI
 from chromadb.config import Settings
@@ -17,6 +23,16 @@ from blueking.utils.state_db import BrainState
 _DEFAULT_VECTOR_DB_ENV = "BLUEKING_VECTOR_DB_PATH"
 _DEFAULT_VECTOR_DB_PATH = "./vector.db"
 _EMBED_DIMENSIONS = 128
+# Identifies how _hash_embed derives vectors; bump it, and the collection name with it,
+# whenever that changes, since vectors from different schemes cannot be compared.
+_EMBED_SCHEME = "blake2b-v2"
+_GESTALT_COLLECTION = "gestalt-v2"
+_EMBED_SCHEME_KEY = "embedding_scheme"
+_EMBED_SCALE = np.float32(1.0 / 255.0)
+_EMBED_CACHE_SIZE = int(os.getenv("BLUEKING_EMBED_CACHE_SIZE", "4096"))
+_encode = str.encode
+_blake2b = hashlib.blake2b
+_EMBED_BLOCK_SIZE = _blake2b.MAX_DIGEST_SIZE
 
 _chroma_client: ContextVar[ClientAPI | None] = ContextVar(
     "blueking.context.chroma_client", default=None
@@ -27,22 +43,46 @@ _gestalt_collection: ContextVar[Collection | None] = ContextVar(
 _brain_state: ContextVar[BrainState | None] = ContextVar(
     "blueking.context.brain_state", default=None
 )
+# Process-wide clients per resolved persist directory, for contexts that did not inherit the vars.
+_client_by_path: dict[str, ClientAPI] = {}
+_client_lock = threading.Lock()
+# Process-wide Gestalt collections per client; shared clients above make these hit across contexts.
+# Keyed weakly on the client itself; collections reference the server API, not the client.
+_collection_by_client: WeakKeyDictionary[ClientAPI, Collection] = WeakKeyDictionary()
+# Bound getters for the Context accessors, resolved once at import.
+_get_chroma_client = _chroma_client.get
+_get_gestalt_collection = _gestalt_collection.get
+_get_brain_state = _brain_state.get
 
 if TYPE_CHECKING:
     from blueking import blueking_pb2_grpc
 
 
-def _hash_embed(text: str, dimensions: int = _EMBED_DIMENSIONS) -> list[float]:
+@functools.lru_cache(maxsize=_EMBED_CACHE_SIZE)
+def _hash_embed(text: str, dimensions: int = _EMBED_DIMENSIONS) -> npt.NDArray[np.float32]:
     """
     Cheap, deterministic embedding to avoid remote embedding dependencies.
 
+    Results are memoized per text and shared between callers, so the returned
+    array is read-only.
+
     :param text: Input string to embed.
     :param dimensions: Desired embedding vector length.
-    :return: List of floating point values representing the embedding.
+    :return: float32 vector of digest bytes scaled to [0, 1].
     """
-    digest = hashlib.sha256(text.encode()).digest()
-    scale = 1.0 / 255.0
-    return [digest[i % len(digest)] * scale for i in range(dimensions)]
+    data = _encode(text)
+    # One BLAKE2b-512 block per 64 dimensions, each with its own personalization,
+    # so no digest byte is reused across the vector.
+    digest = b"".join(
+        [
+            _blake2b(data, person=b"hash-embed-%d" % block).digest()
+            for block in range(-(-dimensions // _EMBED_BLOCK_SIZE))
+        ]
+    )
+    vector = np.frombuffer(digest, dtype=np.uint8, count=dimensions).astype(np.float32)
+    vector *= _EMBED_SCALE
+    vector.flags.writeable = False
+    return vector
 
 
 def ensure_chroma_client(
@@ -51,6 +91,9 @@ def ensure_chroma_client(
     """
     Get or create a Chroma client rooted at the provided directory.
 
+    Clients are shared process-wide per resolved directory, so contexts that
+    did not inherit the client variable reuse the same client.
+
     :param persist_directory: Optional path for the Chroma persistence directory.
     :return: Active Chroma client instance.
     """
@@ -62,12 +105,17 @@ def ensure_chroma_client(
         persist_directory
         or os.getenv(_DEFAULT_VECTOR_DB_ENV, _DEFAULT_VECTOR_DB_PATH)
     ).expanduser()
-    directory.mkdir(parents=True, exist_ok=True)
-
-    client = chromadb.PersistentClient(
-        path=str(directory),
-        settings=Settings(anonymized_telemetry=False),
-    )
+    key = str(directory.resolve())
+    with _client_lock:
+        client = _client_by_path.get(key)
+        if client is None:
+            if not directory.is_dir():
+                directory.mkdir(parents=True, exist_ok=True)
+            client = chromadb.PersistentClient(
+                path=str(directory),
+                settings=Settings(anonymized_telemetry=False),
+            )
+            _client_by_path[key] = client
     _ = _chroma_client.set(client)
     return client
 
@@ -78,15 +126,30 @@ def ensure_gestalt_collection(
     """
     Get or create the shared Gestalt collection from the current Chroma client.
 
+    The collection is tagged with the embedding scheme that filled it, and one
+    tagged with a different scheme is refused rather than mixed with new vectors.
+
     :param persist_directory: Optional Chroma persistence directory.
     :return: Gestalt Chroma collection.
+    :raises RuntimeError: When the collection was built with another embedding scheme.
     """
     collection = _gestalt_collection.get()
     if collection is not None:
         return collection
 
     client = ensure_chroma_client(persist_directory=persist_directory)
-    collection = client.get_or_create_collection(name="gestalt")
+    collection = _collection_by_client.get(client)
+    if collection is None:
+        collection = client.get_or_create_collection(
+            name=_GESTALT_COLLECTION, metadata={_EMBED_SCHEME_KEY: _EMBED_SCHEME}
+        )
+        scheme = (collection.metadata or {}).get(_EMBED_SCHEME_KEY)
+        if scheme != _EMBED_SCHEME:
+            raise RuntimeError(
+                f"Collection {_GESTALT_COLLECTION!r} holds {scheme!r} embeddings, "
+                + f"expected {_EMBED_SCHEME!r}; rebuild it or use a fresh vector store"
+            )
+        _collection_by_client[client] = collection
     _ = _gestalt_collection.set(collection)
     return collection
 
@@ -101,6 +164,58 @@ def init_chroma(persist_directory: str | os.PathLike[str] | None = None) -> Coll
     return ensure_gestalt_collection(persist_directory)
 
 
+def load_chroma(
+    persist_directory: str | os.PathLike[str] | None = None,
+) -> tuple[ClientAPI, Collection]:
+    """
+    Initialize the Chroma client and Gestalt collection and return both handles.
+
+    Context variables set by a worker thread stay in that thread's context, so
+    callers running this off-loop should hand the result to :func:`publish_chroma`.
+
+    :param persist_directory: Optional Chroma persistence directory.
+    :return: Tuple of the Chroma client and the Gestalt collection.
+    """
+    client = ensure_chroma_client(persist_directory)
+    return client, ensure_gestalt_collection(persist_directory)
+
+
+def publish_chroma(client: ClientAPI, collection: Collection) -> None:
+    """
+    Publish an initialized Chroma client and Gestalt collection into the current context.
+
+    :param client: Chroma client to expose.
+    :param collection: Gestalt collection to expose.
+    :return: None.
+    """
+    _ = _chroma_client.set(client)
+    _ = _gestalt_collection.set(collection)
+    _collection_by_client[client] = collection
+
+
+def embed_text_np(text: str) -> npt.NDArray[np.float32]:
+    """
+    Produce a deterministic embedding as a NumPy array; Chroma accepts these directly.
+
+    :param text: Raw text to embed.
+    :return: Deterministic, read-only float32 embedding vector.
+    """
+    return _hash_embed(text)
+
+
+def embed_texts(texts: Sequence[str]) -> npt.NDArray[np.float32]:
+    """
+    Embed several texts into one contiguous array, one row per text.
+
+    :param texts: Raw texts to embed.
+    :return: float32 array of shape ``(len(texts), 128)``.
+    """
+    out = np.empty((len(texts), _EMBED_DIMENSIONS), dtype=np.float32)
+    for row, text in zip(out, texts):
+        row[:] = _hash_embed(text)
+    return out
+
+
 def embed_text(text: str) -> list[float]:
     """
     Produce a deterministic embedding for use with Chroma add/query APIs.
@@ -108,7 +223,7 @@ def embed_text(text: str) -> list[float]:
     :param text: Raw text to embed.
     :return: Deterministic embedding vector.
     """
-    return _hash_embed(text)
+    return _hash_embed(text).tolist()
 
 
 def set_brain_state(state: BrainState) -> Token[BrainState | None]:
@@ -142,6 +257,26 @@ def get_brain_state(default: BrainState | None = None) -> BrainState | None:
     return state if state is not None else default
 
 
+_outbound_stub_ref: ContextVar[blueking_pb2_grpc.GestaltStub | None] | None = None
+
+
+def _resolve_outbound_stub_var() -> ContextVar[blueking_pb2_grpc.GestaltStub | None] | None:
+    """
+    Import the outbound stub context variable on first use and keep it.
+
+    :return: The gRPC module's stub context variable, or None when it cannot be imported.
+    """
+    global _outbound_stub_ref
+    if _outbound_stub_ref is None:
+        # Lazy import to avoid cycles; failures are retried so a partial import is not pinned.
+        try:
+            from blueking.grpc import _outbound_stub  # type: ignore
+        except Exception:
+            return None
+        _outbound_stub_ref = _outbound_stub
+    return _outbound_stub_ref
+
+
 class Context:
     """
     Convenience accessor for global context variables used across the app.
@@ -149,15 +284,15 @@ class Context:
 
     @property
     def chroma_client(self) -> ClientAPI | None:
-        return _chroma_client.get()
+        return _get_chroma_client()
 
     @property
     def gestalt_collection(self) -> Collection | None:
-        return _gestalt_collection.get()
+        return _get_gestalt_collection()
 
     @property
     def brain_state(self) -> BrainState | None:
-        return _brain_state.get()
+        return _get_brain_state()
 
     @property
     def outbound_stub(self) -> blueking_pb2_grpc.GestaltStub | None:
@@ -166,12 +301,8 @@ class Context:
 
         :return: GestaltStub instance or None when unavailable.
         """
-        # Lazy import to avoid cycles; returns None if stub is unavailable.
-        try:
-            from blueking.grpc import _outbound_stub  # type: ignore
-        except Exception:
-            return None
-        return _outbound_stub.get()
+        stub_var = _resolve_outbound_stub_var()
+        return None if stub_var is None else stub_var.get()
 
 
 # Shared instance for easy import.
@@ -182,7 +313,11 @@ __all__ = [
     "ensure_chroma_client",
     "ensure_gestalt_collection",
     "init_chroma",
+    "load_chroma",
+    "publish_chroma",
     "embed_text",
+    "embed_text_np",
+    "embed_texts",
     "set_brain_state",
     "reset_brain_state",
     "get_brain_state",
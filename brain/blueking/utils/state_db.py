@@ -1,12 +1,101 @@
+import atexit
 import os
 import pickle
+import struct
+import threading
+import weakref
+from contextlib import contextmanager
 from typing import ContextManager, final, override, cast, Self
 from typing_extensions import Buffer
-from collections.abc import MutableMapping, Iterator, Iterable
+from collections.abc import Generator, MutableMapping, Iterator, Iterable
 
 import lmdb
 from pydantic import BaseModel
 
+_READ_CACHE_SIZE = 128
+# Only values that cannot be mutated through the returned reference are cached.
+_CACHEABLE_TYPES = frozenset({str, bytes, int, float, complex, bool, type(None)})
+_PICKLE_PROTOCOL = 5
+# Buffers at least this large are stored after the pickle stream instead of inside it.
+_OOB_THRESHOLD = 64 * 1024
+# Record prefix for out-of-band layouts; plain pickles always start with b"\x80".
+_OOB_MAGIC = b"BKOB"
+
+# Non-durable environments still open at exit; weak so instances can be collected.
+_UNSYNCED_ENVS: weakref.WeakSet[lmdb.Environment] = weakref.WeakSet()
+
+
+@atexit.register
+def _sync_envs() -> None:
+    """
+    Flush non-durable LMDB environments to disk before the interpreter exits.
+
+    :return: None.
+    """
+    for env in list(_UNSYNCED_ENVS):
+        env.sync(True)
+
+
+def _dump_value(value: object) -> bytes:
+    """
+    Serialize a value, moving large contiguous buffers out of the pickle stream.
+
+    Out-of-band records are laid out as magic, buffer count, the pickle and
+    buffer lengths, then the pickle followed by the raw buffers.
+
+    :param value: Object to serialize.
+    :return: Plain pickle bytes, or an out-of-band record when large buffers are present.
+    """
+    buffers: list[pickle.PickleBuffer] = []
+
+    def _collect(buffer: pickle.PickleBuffer) -> bool:
+        """
+        Keep small buffers in-band and collect large ones.
+
+        :param buffer: Buffer offered by the pickler.
+        :return: True to serialize in-band, False to keep it out-of-band.
+        """
+        if buffer.raw().nbytes < _OOB_THRESHOLD:
+            return True
+        buffers.append(buffer)
+        return False
+
+    data = pickle.dumps(value, protocol=_PICKLE_PROTOCOL, buffer_callback=_collect)
+    if not buffers:
+        return data
+    raws = [buffer.raw() for buffer in buffers]
+    header = struct.pack(
+        f"<4sI{len(raws) + 1}Q", _OOB_MAGIC, len(raws), len(data), *(raw.nbytes for raw in raws)
+    )
+    return b"".join((header, data, *raws))
+
+
+def _load_value(data: Buffer) -> object:
+    """
+    Deserialize a record written by :func:`_dump_value`.
+
+    Out-of-band buffers are copied once into a shared writable buffer, so
+    arrays come back writable as they do from a plain pickle.
+
+    :param data: Stored record bytes.
+    :return: Deserialized value.
+    """
+    view = memoryview(data)
+    if view[:4].tobytes() != _OOB_MAGIC:
+        return pickle.loads(view)
+    (count,) = struct.unpack_from("<I", view, 4)
+    sizes = struct.unpack_from(f"<{count + 1}Q", view, 8)
+    offset = 8 + 8 * (count + 1)
+    end = offset + sizes[0]
+    pickled = view[offset:end]
+    payload = memoryview(bytearray(view[end:]))
+    buffers: list[memoryview] = []
+    start = 0
+    for size in sizes[1:]:
+        buffers.append(payload[start:start + size])
+        start += size
+    return pickle.loads(pickled, buffers=buffers)
+
 
 class BrainState(BaseModel):
     username: str = ""
@@ -18,6 +107,11 @@ class BrainState(BaseModel):
 class LmdbDict(MutableMapping[str, object]):
     """
     LMDB-backed mutable mapping that exposes attributes for state access.
+
+    Immutable scalar values are kept in a small per-instance LRU cache that
+    is invalidated after writes through this mapping commit; writes made by
+    other processes to the same environment are not observed while a key is
+    cached. Every other value is unpickled afresh on each lookup.
     """
 
     _env: lmdb.Environment | None = None
@@ -46,17 +140,67 @@ class LmdbDict(MutableMapping[str, object]):
         if path is None:
             path = os.environ.get("BLUEKING_STATE_DB_PATH", "./state.db")
 
-        object.__setattr__(self, "_env", lmdb.open(
+        # BrainState is session data: skip per-commit fsyncs unless durability is requested.
+        # Without them the latest commits can be lost, and with writemap an OS crash or
+        # power loss can corrupt the whole environment; stray writes into the writable
+        # map can corrupt it too. Set BLUEKING_STATE_DB_DURABLE=1 when that matters.
+        durable = os.environ.get("BLUEKING_STATE_DB_DURABLE", "0") == "1"
+        env = cast(lmdb.Environment, lmdb.open(
             path,
             map_size=map_size,
             max_dbs=1,
-            writemap=False,
-            sync=True,
-            metasync=True,
+            writemap=not durable,
+            sync=durable,
+            metasync=durable,
+            map_async=not durable,
             lock=True,
             readahead=True
         ))
+        if not durable:
+            _UNSYNCED_ENVS.add(env)
+        object.__setattr__(self, "_env", env)
         object.__setattr__(self, "_db", cast(lmdb.Environment, self._env).open_db())
+        # Underscore names bypass the mapping in __setattr__ and land on the instance.
+        self._read_cache: dict[str, object] = {}
+        self._cache_lock: threading.Lock = threading.Lock()
+        # Bumped after every committed write so in-flight reads know not to cache.
+        self._generation: int = 0
+        self._local: threading.local = threading.local()
+
+    @contextmanager
+    def _read_txn(self) -> Generator[lmdb.Transaction]:
+        """
+        Yield a read transaction, reusing one already held by the current thread.
+
+        Holding this across several lookups shares one transaction between
+        them; lookups inside the block see the snapshot taken when the
+        outermost block opened and bypass the read cache, so they neither
+        return values newer than that snapshot nor cache values older than
+        later writes.
+
+        :return: Generator yielding the active read transaction.
+        """
+        held = cast(lmdb.Transaction | None, getattr(self._local, "txn", None))
+        if held is not None:
+            yield held
+            return
+        with cast(lmdb.Environment, self._env).begin() as txn:
+            self._local.txn = txn
+            try:
+                yield txn
+            finally:
+                self._local.txn = None
+
+    def _invalidate(self, key: str) -> None:
+        """
+        Drop a cached value after a write to its key has committed.
+
+        :param key: Key that was written or deleted.
+        :return: None.
+        """
+        with self._cache_lock:
+            self._generation += 1
+            _ = self._read_cache.pop(key, None)
 
     @override
     def __getitem__(self, key: str) -> object:
@@ -67,12 +211,35 @@ class LmdbDict(MutableMapping[str, object]):
         :return: Deserialized value.
         :raises KeyError: When the key does not exist.
         """
+        held = cast(lmdb.Transaction | None, getattr(self._local, "txn", None))
+        if held is not None:
+            val = cast(Buffer | None, held.get(str(key).encode()))
+            if val is None:
+                raise KeyError(key)
+            return _load_value(val)
+
+        cache = self._read_cache
+        with self._cache_lock:
+            if key in cache:
+                # Re-insert to mark the entry most recently used.
+                value = cache[key] = cache.pop(key)
+                return value
+            generation = self._generation
         k = str(key).encode()
+        # A bare transaction here; the generic context manager costs more than the lookup.
         with cast(lmdb.Environment, self._env).begin() as txn:
             val = cast(Buffer | None, txn.get(k))
             if val is None:
                 raise KeyError(key)
-            return pickle.loads(val)
+            value = _load_value(val)
+        if type(value) in _CACHEABLE_TYPES:
+            with self._cache_lock:
+                # A write that committed meanwhile may postdate this snapshot.
+                if generation == self._generation:
+                    if len(cache) >= _READ_CACHE_SIZE:
+                        del cache[next(iter(cache))]
+                    cache[key] = value
+        return value
 
     @override
     def __setitem__(self, key: str, value: object) -> None:
@@ -85,10 +252,11 @@ class LmdbDict(MutableMapping[str, object]):
         :return: None.
         """
         k = str(key).encode()
-        v = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        v = _dump_value(value)
         with cast(lmdb.Environment, self._env).begin(write=True) as txn:
             if not txn.put(k, v):
                 raise RuntimeError("put failed")
+        self._invalidate(key)
 
     @override
     def __delitem__(self, key: str) -> None:
@@ -103,6 +271,7 @@ class LmdbDict(MutableMapping[str, object]):
         with cast(lmdb.Environment, self._env).begin(write=True) as txn:
             if not txn.delete(k):
                 raise KeyError(key)
+        self._invalidate(key)
 
     @override
     def __iter__(self) -> Iterator[str]:
@@ -111,10 +280,11 @@ class LmdbDict(MutableMapping[str, object]):
 
         :return: Iterator of decoded keys.
         """
-        with cast(lmdb.Environment, self._env).begin() as txn:
+        # Collect keys up front so the transaction is not held open by a paused iterator.
+        with self._read_txn() as txn:
             with cast(ContextManager[Iterable[tuple[bytes, object]]], txn.cursor()) as cur:
-                for k, _ in cur:
-                    yield k.decode()
+                decoded = [k.decode() for k, _ in cur]
+        yield from decoded
 
     @override
     def __len__(self) -> int:
@@ -123,8 +293,8 @@ class LmdbDict(MutableMapping[str, object]):
 
         :return: Entry count.
         """
-        with cast(lmdb.Environment, self._env).begin() as txn:
-            return cast(int, txn.stat(self.db)["entries"])
+        with self._read_txn() as txn:
+            return cast(int, txn.stat(self._db)["entries"])
 
     @override
     def __setattr__(self, name: str, value: object) -> None:
@@ -165,6 +335,9 @@ class LmdbDict(MutableMapping[str, object]):
         :return: Stored value.
         :raises AttributeError: When the key is missing.
         """
+        # Underscore names live on the instance, never in the mapping.
+        if name.startswith("_"):
+            raise AttributeError(name)
         try:
             return self[name]
         except KeyError as exc:
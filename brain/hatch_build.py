@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import yaml
+from hatchling.builders.hooks.plugin.interface import BuildHookInterface
+
+CONFIG_GLOBS = ("blueking/agents/*/config.yaml", "blueking/tasks/*/config.yaml")
+COMPILED_SUFFIX = ".json"
+
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def compile_config(source: Path) -> Path:
+    """
+    Parse a YAML config once and write it next to the source as JSON.
+
+    :param source: Path to the YAML configuration file.
+    :return: Path to the written JSON file.
+    """
+    with source.open(encoding="utf-8") as handle:
+        data = yaml.load(handle, Loader=_Loader) or {}
+    compiled = source.with_suffix(COMPILED_SUFFIX)
+    with compiled.open("w", encoding="utf-8") as handle:
+        json.dump(data, handle, ensure_ascii=False)
+    return compiled
+
+
+class ConfigBuildHook(BuildHookInterface):  # pyright: ignore[reportMissingTypeArgument]
+    """
+    Pre-compile agent and task YAML configs so runtime loading skips the YAML parser.
+    """
+
+    PLUGIN_NAME = "custom"
+
+    def initialize(self, version: str, build_data: dict[str, Any]) -> None:
+        """
+        Generate JSON configs and register them as build artifacts.
+
+        :param version: Build version requested by hatch.
+        :param build_data: Mutable build metadata shared with the builder.
+        :return: None.
+        """
+        root = Path(self.root)
+        for pattern in CONFIG_GLOBS:
+            for source in sorted(root.glob(pattern)):
+                compiled = compile_config(source)
+                build_data["artifacts"].append(compiled.relative_to(root).as_posix())